@@ -25,7 +25,8 @@ CREATE TABLE Vote(
 	id_member integer REFERENCES Member(id) NOT NULL,
 	id_action integer REFERENCES Action(id) NOT NULL,
 	vote_decision varchar NOT NULL,
-	creation_date timestamp without time zone NOT NULL);
+	creation_date timestamp without time zone NOT NULL,
+	CONSTRAINT vote_uniq UNIQUE (id_member, id_action));
 
 CREATE SEQUENCE id_distribution;
 
@@ -44,17 +45,21 @@ CREATE OR REPLACE FUNCTION update_votes()
 RETURNS TRIGGER
 AS $X$
 BEGIN
+IF TG_OP='INSERT' THEN
 IF NEW.vote_decision='up' THEN UPDATE action SET upvotes=upvotes+1 WHERE NEW.id_action=action.id; END IF;
 IF NEW.vote_decision='down' THEN UPDATE action SET downvotes=downvotes+1 WHERE NEW.id_action=action.id; END IF;
+ELSE
+IF OLD.vote_decision='up' THEN UPDATE action SET upvotes=upvotes-1 WHERE OLD.id_action=action.id; END IF;
+IF OLD.vote_decision='down' THEN UPDATE action SET downvotes=downvotes-1 WHERE OLD.id_action=action.id; END IF;
+END IF;
 RETURN NULL;
 END
 $X$ LANGUAGE plpgsql;
 
 CREATE TRIGGER vote_updater
-AFTER INSERT ON vote
+AFTER INSERT OR DELETE ON vote
 FOR EACH ROW
 EXECUTE PROCEDURE update_votes();
-END;
 
 CREATE OR REPLACE FUNCTION check_id()
 RETURNS TRIGGER
@@ -70,19 +75,16 @@ CREATE TRIGGER id_consistency
 BEFORE INSERT ON member
 FOR EACH ROW
 EXECUTE PROCEDURE check_id();
-END;
 
 CREATE TRIGGER id_consistency
 BEFORE INSERT ON action
 FOR EACH ROW
 EXECUTE PROCEDURE check_id();
-END;
 
 CREATE TRIGGER id_consistency
 BEFORE INSERT ON project
 FOR EACH ROW
 EXECUTE PROCEDURE check_id();
-END;
 
 
 CREATE OR REPLACE FUNCTION update_timestamp()
@@ -98,16 +100,21 @@ CREATE TRIGGER date_updater
 AFTER INSERT ON project
 FOR EACH ROW
 EXECUTE PROCEDURE update_timestamp("id_leader");
-END;
 
 CREATE TRIGGER date_updater
 AFTER INSERT ON action
 FOR EACH ROW
 EXECUTE PROCEDURE update_timestamp("id_member");
-END;
 
 CREATE TRIGGER date_updater
 AFTER INSERT ON vote
 FOR EACH ROW
 EXECUTE PROCEDURE update_timestamp("id_member");
-END;
+
+CREATE INDEX IF NOT EXISTS vote_action_idx ON vote(id_action);
+
+CREATE INDEX IF NOT EXISTS action_project_idx ON action(id_project);
+
+CREATE INDEX IF NOT EXISTS action_member_idx ON action(id_member);
+
+CREATE INDEX IF NOT EXISTS project_leader_idx ON project(id_leader);
@@ -0,0 +1,48 @@
+DO $X$
+BEGIN
+IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname='vote_uniq' AND conrelid='vote'::regclass) THEN
+ALTER TABLE vote ADD CONSTRAINT vote_uniq UNIQUE (id_member, id_action);
+END IF;
+
+IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname='vote_updater' AND tgrelid='vote'::regclass
+               AND tgtype & 8 = 8) THEN
+CREATE OR REPLACE FUNCTION update_votes()
+RETURNS TRIGGER
+AS $Y$
+BEGIN
+IF TG_OP='INSERT' THEN
+IF NEW.vote_decision='up' THEN UPDATE action SET upvotes=upvotes+1 WHERE NEW.id_action=action.id; END IF;
+IF NEW.vote_decision='down' THEN UPDATE action SET downvotes=downvotes+1 WHERE NEW.id_action=action.id; END IF;
+ELSE
+IF OLD.vote_decision='up' THEN UPDATE action SET upvotes=upvotes-1 WHERE OLD.id_action=action.id; END IF;
+IF OLD.vote_decision='down' THEN UPDATE action SET downvotes=downvotes-1 WHERE OLD.id_action=action.id; END IF;
+END IF;
+RETURN NULL;
+END
+$Y$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS vote_updater ON vote;
+
+CREATE TRIGGER vote_updater
+AFTER INSERT OR DELETE ON vote
+FOR EACH ROW
+EXECUTE PROCEDURE update_votes();
+END IF;
+
+IF to_regclass('public.vote_action_idx') IS NULL THEN
+CREATE INDEX vote_action_idx ON vote(id_action);
+END IF;
+
+IF to_regclass('public.action_project_idx') IS NULL THEN
+CREATE INDEX action_project_idx ON action(id_project);
+END IF;
+
+IF to_regclass('public.action_member_idx') IS NULL THEN
+CREATE INDEX action_member_idx ON action(id_member);
+END IF;
+
+IF to_regclass('public.project_leader_idx') IS NULL THEN
+CREATE INDEX project_leader_idx ON project(id_leader);
+END IF;
+END
+$X$;
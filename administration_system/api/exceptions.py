@@ -1,8 +1,8 @@
-import psycopg2
+import psycopg
 from abc import ABC
 
 
-class DatabaseException(psycopg2.InternalError, ABC):
+class DatabaseException(psycopg.InternalError, ABC):
     pass
 
 
@@ -1,13 +1,109 @@
-import psycopg2
-from datetime import datetime
-import json
-from .exceptions import DatabaseException, InvalidMember, InvalidRowCount
-from functools import reduce
+import psycopg
+from psycopg.conninfo import make_conninfo
+from psycopg.pq import PipelineStatus
+from psycopg_pool import ConnectionPool
+import os
+import orjson
+from .exceptions import InvalidMember, InvalidRowCount
+from functools import lru_cache
+from shutil import copyfileobj
+from tempfile import SpooledTemporaryFile
+from uuid import uuid4
+from time import monotonic, localtime, time
+
+
+_INSERT_ACTION = "INSERT INTO action VALUES (%s, %s, %s, %s, to_timestamp(%s))"
+_INSERT_VOTE = "INSERT INTO vote VALUES (%s, %s, %s, to_timestamp(%s)) ON CONFLICT DO NOTHING RETURNING 1"
+_INSERT_MEMBER = "INSERT INTO member VALUES (%s, crypt(%s, gen_salt('bf')), %s, to_timestamp(%s))"
+_INSERT_PROJECT = "INSERT INTO project(id, id_leader, creation_date) VALUES (%s, %s, to_timestamp(%s)) RETURNING 1"
+_UPSERT_MEMBER = "WITH existing AS (SELECT password, activity_date FROM member WHERE id=%(member)s::integer), " \
+                 "inserted AS (INSERT INTO member " \
+                 "SELECT %(member)s::integer, crypt(%(password)s::text, gen_salt('bf')), 'regular', " \
+                 "to_timestamp(%(timestamp)s) " \
+                 "WHERE NOT EXISTS (SELECT 1 FROM existing) RETURNING activity_date) " \
+                 "SELECT password=crypt(%(password)s::text, password), activity_date, false FROM existing " \
+                 "UNION ALL SELECT true, activity_date, true FROM inserted"
+_SELECT_MEMBER_AUTH = "SELECT * FROM member WHERE id=%s AND password=crypt(%s, password)"
+_SELECT_TROLLS = "SELECT COALESCE(json_agg(json_build_array(id, upvotes, downvotes, active) " \
+                 "ORDER BY downvotes - upvotes DESC, id ASC), '[]')::text " \
+                 "FROM (SELECT member.id, sum(upvotes) AS upvotes, sum(downvotes) AS downvotes, " \
+                 "EXTRACT(YEAR FROM to_timestamp(%s)) - EXTRACT(YEAR FROM member.activity_date) <= 0 AS active " \
+                 "FROM member " \
+                 "JOIN action ON (member.id=action.id_member) " \
+                 "GROUP BY member.id, member.activity_date " \
+                 "HAVING sum(downvotes) - sum(upvotes) > 0) AS trolls"
+
+_ACTIONS_SQL_TMPL = "SELECT COALESCE(json_agg(json_build_array(" \
+                    "action.id, type, id_project, project.id_leader, upvotes, downvotes" \
+                    ") ORDER BY action.id), '[]')::text FROM action " \
+                    "JOIN project ON (action.id_project=project.id) " \
+                    "{where}"
+_ACTIONS_FILTERS = ('type', 'project.id', 'project.id_leader')
+
+
+def _actions_shape(mask):
+    columns = [column for bit, column in enumerate(_ACTIONS_FILTERS) if mask >> bit & 1]
+    condition = "".join(f" AND {column}=%s" for column in columns)
+    return _ACTIONS_SQL_TMPL.format(where="WHERE 1=1" + condition)
+
+
+_ACTIONS_SHAPES = {mask: _actions_shape(mask) for mask in range(1 << len(_ACTIONS_FILTERS))}
+
+_JSON_AGG_TMPL = "SELECT COALESCE(json_agg(json_build_array({columns}) ORDER BY {order}), '[]')::text " \
+                 "FROM ({rows}) AS result"
+
+_PROJECTS_ROWS_TMPL = "SELECT id, id_leader FROM project {where} ORDER BY id"
+_VOTES_ROWS_TMPL = "SELECT member.id, " \
+                   "count(votes.vote_decision) FILTER (WHERE votes.vote_decision='up') AS upvotes, " \
+                   "count(votes.vote_decision) FILTER (WHERE votes.vote_decision='down') AS downvotes FROM member " \
+                   "LEFT JOIN (SELECT vote.id_member, vote.vote_decision FROM vote " \
+                   "JOIN action ON (vote.id_action=action.id) {where}) AS votes " \
+                   "ON (member.id=votes.id_member) " \
+                   "GROUP BY member.id ORDER BY member.id"
+_PROJECTS_SQL_TMPL = _JSON_AGG_TMPL.format(columns="id, id_leader", order="id", rows=_PROJECTS_ROWS_TMPL)
+_VOTES_SQL_TMPL = _JSON_AGG_TMPL.format(columns="id, upvotes, downvotes", order="id", rows=_VOTES_ROWS_TMPL)
+
+
+_API_ERRORS = (psycopg.InternalError, psycopg.errors.RaiseException)
+
+_DB_DEFINITION_PATH = os.path.join(os.path.dirname(__file__), 'database', 'db_definition.sql')
+_DB_MIGRATIONS_PATH = os.path.join(os.path.dirname(__file__), 'database', 'db_migrations.sql')
+
+with open(_DB_DEFINITION_PATH, 'rb') as definition_file:
+    _DB_DEFINITION = definition_file.read()
+
+with open(_DB_MIGRATIONS_PATH, 'rb') as migrations_file:
+    _DB_MIGRATIONS = migrations_file.read()
+
+_POOL = None
+
+_YEAR_CACHE = [0, 0]
+
+
+def _current_year():
+    now = int(time())
+    if now - _YEAR_CACHE[0] > 60:
+        _YEAR_CACHE[:] = [now, localtime(now).tm_year]
+    return _YEAR_CACHE[1]
+
+
+@lru_cache(maxsize=None)
+def _row_exists_statement(table, columns):
+    condition = " AND ".join(f"{column}=%s" for column in columns)
+    return f"SELECT * FROM {table} WHERE {condition}"
 
 
 class PostgresAPI:
+    __slots__ = ('database', 'user', 'password', 'host', 'connection', 'cursor', '_auth_cache', '_pool')
+
     STATUS_SUCCESS = "OK"
     STATUS_FAILURE = "ERROR"
+    RESPONSE_SUCCESS = f'{{"status": "{STATUS_SUCCESS}"}}'
+    RESPONSE_FAILURE = f'{{"status": "{STATUS_FAILURE}"}}'
+    STREAM_ITERSIZE = 2000
+    STREAM_SPOOL_SIZE = 1 << 20
+    AUTH_CACHE_TTL = 60
+    PREPARE_THRESHOLD = 1
 
     def __init__(self, database=None, user=None, password=None, host=None):
         self.database = database
@@ -16,22 +112,82 @@ class PostgresAPI:
         self.host = host
         self.connection = None
         self.cursor = None
+        self._auth_cache = {}
+        self._pool = None
+
+    @classmethod
+    def configure(cls, dsn=None, minconn=2, maxconn=25, **kwargs):
+        """
+        Creates connection pool shared by all PostgresAPI instances.
+        Connections are handed out by 'open' and given back on exit, so consecutive
+        instances reuse already established sessions together with their prepared statements.
+
+        Keyword arguments are libpq connection parameters, so the database name is passed as 'dbname'.
+        Invalid parameters and unreachable servers are reported immediately, before the pool is created,
+        and the call blocks until 'minconn' connections are open
+
+        :param str dsn: libpq connection string (optional if credentials are passed as keyword arguments)
+        :param int minconn: number of connections opened up front. Defaults to 2
+        :param int maxconn: maximal number of connections in the pool. Defaults to 25
+        """
+        global _POOL
+        if _POOL is not None:
+            _POOL.close()
+            _POOL = None
+        conninfo = make_conninfo(dsn or "", **kwargs)
+        psycopg.connect(conninfo).close()
+        pool = ConnectionPool(conninfo, min_size=minconn, max_size=maxconn, open=True)
+        try:
+            pool.wait()
+        except Exception:
+            pool.close()
+            raise
+        _POOL = pool
 
-    def open(self, database, user, password, host='localhost', db_path='database/db_definition.sql'):
+    def open(self, database, user, password, host='localhost', db_path=None):
         """
         Establishes connection with database using credentials given in parameters.
-        Also constructs database with 'db_definition.sql' file from current project
+        Connection is taken from the shared pool, which is configured with these credentials
+        if 'configure' has not been called before.
+        Also constructs database with 'db_definition.sql' file from current project,
+        unless the schema already exists. Existing databases are brought up to date
+        with 'db_migrations.sql' instead, which only adds missing constraints, triggers and indexes
 
         :param str database: database to open
         :param str user: user opening database
         :param str password: password to user's account
         :param str host: place where database server is hosted. Defaults to 'localhost'
-        :param str db_path: path to database model (.sql) file (optional)
+        :param str db_path: path to database model (.sql) file (optional).
+            Defaults to 'db_definition.sql' read once at import time
         """
-        self.connection = psycopg2.connect(database=database, user=user,
-                                           password=password, host=host)
+        if _POOL is None:
+            self.configure(dbname=database, user=user, password=password, host=host)
+        self._pool = _POOL
+        self.connection = self._pool.getconn()
+        self.connection.prepare_threshold = self.PREPARE_THRESHOLD
         self.cursor = self.connection.cursor()
-        self.cursor.execute(open(db_path).read())
+        self.cursor.execute("SELECT to_regclass('public.member')")
+        if self.cursor.fetchone()[0] is None:
+            if db_path is None:
+                self._define_database(_DB_DEFINITION)
+            else:
+                with open(db_path, 'rb') as definition_file:
+                    self._define_database(definition_file.read())
+        elif db_path is None:
+            self.cursor.execute(_DB_MIGRATIONS, prepare=False)
+        self.connection.commit()
+
+    def close(self):
+        """
+        Gives connection back to the pool it was taken from, even if 'configure' has replaced it since.
+        Safe to call more than once
+        and when 'open' was never called
+        """
+        if self.connection is not None:
+            self._pool.putconn(self.connection)
+            self.connection = None
+            self.cursor = None
+            self._pool = None
 
     def leader(self, timestamp, password, member):
         """
@@ -42,11 +198,11 @@ class PostgresAPI:
         :param str password: password of new leader
         :param int member: id of new leader
         """
-        timestamp = datetime.fromtimestamp(timestamp)
         try:
-            self._create_member(member, password, 'leader', timestamp)
-        except psycopg2.InternalError:
-            return json.dumps({'status': self.STATUS_FAILURE})
+            with self.connection.transaction():
+                self._create_member(member, password, 'leader', timestamp)
+        except _API_ERRORS:
+            return self.RESPONSE_FAILURE
 
     def support(self, timestamp, member, password, action, project, authority=None):
         """
@@ -118,43 +274,44 @@ class PostgresAPI:
         :rtype: json
         :return: all actions in current state of the database
         """
-        condition_payload = {'type': action_type, 'project.id': project, 'project.id_leader': authority}
-        condition = self._generate_condition(**condition_payload)
-
-        expr = "SELECT DISTINCT action.id, type, id_project, project.id_leader, upvotes, downvotes FROM action " \
-               "LEFT JOIN vote ON (action.id=vote.id_action) " \
-               "JOIN project ON (action.id_project=project.id) " \
-               f"{condition} ORDER BY action.id"
+        mask = (action_type is not None) | (project is not None) << 1 | (authority is not None) << 2
+        params = tuple(value for value in (action_type, project, authority) if value is not None)
 
         try:
-            self._verify_leader(member, password)
-            self.cursor.execute(expr)
-            return json.dumps({'status': self.STATUS_SUCCESS, 'data': self.cursor.fetchall()})
-        except psycopg2.InternalError:
-            return json.dumps({'status': self.STATUS_FAILURE})
-
-    def projects(self, member, password, authority=None, **_):
+            with self.connection.transaction():
+                self._verify_leader(member, password)
+                self.cursor.execute(_ACTIONS_SHAPES[mask], params)
+                return self._json_response(self.cursor.fetchone()[0])
+        except _API_ERRORS:
+            return self.RESPONSE_FAILURE
+
+    def projects(self, member, password, authority=None, output=None, **_):
         """
         Returns all projects in current state of the database
 
         :param int member: id of member who requests for projects
         :param str password: member's password
         :param int authority: if passed, function returns all projects created by indicated authority (optional)
+        :param output: binary file-like object. If passed, response is written into it instead of being returned.
+            Outside pipeline mode rows are fetched through a server-side cursor, so memory usage stays bounded (optional)
         :rtype: json
-        :return: all projects in current state of the database
+        :return: all projects in current state of the database, None if response was written to 'output'
         """
         condition_payload = {'id_leader': authority}
-        condition = self._generate_condition(**condition_payload)
-        expr = f"SELECT DISTINCT id, id_leader FROM project {condition} ORDER BY id"
+        condition, params = self._generate_condition(**condition_payload)
 
         try:
-            self._verify_leader(member, password)
-            self.cursor.execute(expr.format(condition))
-            return json.dumps({'status': self.STATUS_SUCCESS, 'data': self.cursor.fetchall()})
-        except psycopg2.InternalError:
-            return json.dumps({'status': self.STATUS_FAILURE})
-
-    def votes(self, member, password, action=None, project=None, **_):
+            with self.connection.transaction():
+                self._verify_leader(member, password)
+                if output is not None and self._can_stream():
+                    return self._stream_response(_PROJECTS_ROWS_TMPL.format(where=condition), params, output)
+                self.cursor.execute(_PROJECTS_SQL_TMPL.format(where=condition), params)
+                response = self._json_response(self.cursor.fetchone()[0])
+        except _API_ERRORS:
+            response = self.RESPONSE_FAILURE
+        return self._write_response(response, output)
+
+    def votes(self, member, password, action=None, project=None, output=None, **_):
         """
         Returns all votes in current state of the database
 
@@ -163,24 +320,24 @@ class PostgresAPI:
         :param int action: if passed, function returns all votes for indicated action (optional)
         :param int project: if passed, function returns all votes for actions
             defined for indicated project (optional)
+        :param output: binary file-like object. If passed, response is written into it instead of being returned.
+            Outside pipeline mode rows are fetched through a server-side cursor, so memory usage stays bounded (optional)
         :rtype: json
-        :return: all votes in current state of the database
+        :return: all votes in current state of the database, None if response was written to 'output'
         """
-        condition_payload = {'vote.id_action': action, 'project.id': project}
-        condition = self._generate_condition(**condition_payload)
-        expr = "SELECT DISTINCT member.id, COALESCE(upvotes, 0), COALESCE(downvotes, 0) FROM member " \
-               "LEFT JOIN (SELECT vote.id_member, upvotes, downvotes FROM vote " \
-               "LEFT JOIN action ON (vote.id_action=action.id) " \
-               f"JOIN project ON (action.id_project=project.id) {condition}) AS votes " \
-               "ON (member.id=votes.id_member) " \
-               "ORDER BY member.id"
+        condition_payload = {'vote.id_action': action, 'action.id_project': project}
+        condition, params = self._generate_condition(**condition_payload)
 
         try:
-            self._verify_leader(member, password)
-            self.cursor.execute(expr.format(condition))
-            return json.dumps({'status': self.STATUS_SUCCESS, 'data': self.cursor.fetchall()})
-        except psycopg2.InternalError:
-            return json.dumps({'status': self.STATUS_FAILURE})
+            with self.connection.transaction():
+                self._verify_leader(member, password)
+                if output is not None and self._can_stream():
+                    return self._stream_response(_VOTES_ROWS_TMPL.format(where=condition), params, output)
+                self.cursor.execute(_VOTES_SQL_TMPL.format(where=condition), params)
+                response = self._json_response(self.cursor.fetchone()[0])
+        except _API_ERRORS:
+            response = self.RESPONSE_FAILURE
+        return self._write_response(response, output)
 
     def trolls(self, timestamp):
         """
@@ -191,63 +348,64 @@ class PostgresAPI:
         :rtype: json
         :return: all trolls in current state of the database
         """
-        timestamp = datetime.fromtimestamp(timestamp)
-        expr = "SELECT member.id, sum(upvotes), sum(downvotes), " \
-               f"EXTRACT(YEAR FROM '{timestamp}'::timestamp without time zone) - " \
-               "EXTRACT(YEAR FROM member.activity_date) <= 0 " \
-               "FROM member " \
-               "JOIN action ON (member.id=action.id_member) " \
-               "WHERE downvotes - upvotes > 0 " \
-               "GROUP BY member.id, upvotes, downvotes ORDER BY downvotes-upvotes DESC, member.id ASC"
-
         try:
-            self.cursor.execute(expr)
-            return json.dumps({'status': self.STATUS_SUCCESS, 'data': self.cursor.fetchall()})
-        except psycopg2.InternalError:
-            return json.dumps({'status': self.STATUS_FAILURE})
+            with self.connection.transaction():
+                self.cursor.execute(_SELECT_TROLLS, (timestamp,))
+                return self._json_response(self.cursor.fetchone()[0])
+        except _API_ERRORS:
+            return self.RESPONSE_FAILURE
 
     def __enter__(self):
         self.open(self.database, self.user, self.password, self.host)
         return self
 
     def __del__(self):
-        self.connection.close()
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def __exit__(self, *args):
-        self.__del__()
+        self.close()
 
-    def _define_action(self, timestamp, member, password, action, project, statement, authority=None):
-        timestamp = datetime.fromtimestamp(timestamp)
-        expr = "INSERT INTO action VALUES " \
-               f"({action}, {project}, {member}, '{statement}', '{timestamp}')"
+    def _define_database(self, definition):
+        self.cursor.execute("SET LOCAL synchronous_commit = off")
+        self.cursor.execute(definition, prepare=False)
 
+    def _define_action(self, timestamp, member, password, action, project, statement, authority=None):
         try:
-            self._handle_member(member, password, timestamp)
-            self._handle_project(project, authority, timestamp)
-            self.cursor.execute(expr)
-            return json.dumps({'status': self.STATUS_SUCCESS})
-        except psycopg2.InternalError:
-            return json.dumps({'status': self.STATUS_FAILURE})
+            with self.connection.transaction():
+                self._handle_member(member, password, timestamp)
+                self._handle_project(project, authority, timestamp)
+                self.cursor.execute(_INSERT_ACTION, (action, project, member, statement, timestamp))
+                self._touch_member(member, timestamp)
+                return self.RESPONSE_SUCCESS
+        except _API_ERRORS:
+            return self.RESPONSE_FAILURE
 
     def _vote(self, timestamp, member, password, action, vote):
-        timestamp = datetime.fromtimestamp(timestamp)
-        expr = "INSERT INTO vote VALUES " \
-               f"({member}, {action}, '{vote}', '{timestamp}')"
-
         try:
-            self._handle_member(member, password, timestamp)
-            self._row_existence_check('action', id=action)
-            self.cursor.execute(expr)
-            return json.dumps({'status': self.STATUS_SUCCESS})
-        except psycopg2.InternalError:
-            return json.dumps({'status': self.STATUS_FAILURE})
+            with self.connection.transaction():
+                self._handle_member(member, password, timestamp)
+                try:
+                    self.cursor.execute(_INSERT_VOTE, (member, action, vote, timestamp))
+                    inserted = self.cursor.fetchone()
+                except psycopg.IntegrityError:
+                    raise InvalidRowCount(f"No rows in 'action' table containing id {action}")
+                if inserted is None:
+                    raise InvalidRowCount(f"Member {member} have already voted for action {action}")
+                self._touch_member(member, timestamp)
+                return self.RESPONSE_SUCCESS
+        except _API_ERRORS:
+            return self.RESPONSE_FAILURE
 
     def _handle_member(self, member, password, timestamp):
-        try:
-            self._row_existence_check('member', id=member)
-            self._validate_member(member, password)
-        except DatabaseException:
-            self._create_member(member, password, 'regular', timestamp)
+        if self._is_authenticated(member, password):
+            return
+        self.cursor.execute(_UPSERT_MEMBER, {'member': member, 'password': password, 'timestamp': timestamp})
+        valid, activity_date, inserted = self.cursor.fetchone()
+        if not inserted:
+            self._accept_member(member, password, activity_date if valid else None)
 
     def _handle_project(self, project, authority, timestamp):
         try:
@@ -256,20 +414,39 @@ class PostgresAPI:
             if authority is None:
                 raise InvalidMember("'authority' parameter should be passed if project is not defined")
 
-            expr = "INSERT INTO project(id, id_leader, creation_date) VALUES " \
-                   f"({project}, {authority}, '{timestamp}')"
-            self.cursor.execute(expr)
+            try:
+                self.cursor.execute(_INSERT_PROJECT, (project, authority, timestamp))
+                self.cursor.fetchone()
+            except psycopg.IntegrityError:
+                raise InvalidRowCount(f"No rows in 'member' table containing id {authority}")
+            self._touch_member(authority, timestamp)
 
     def _create_member(self, member, password, rank, timestamp):
-        expr = "INSERT INTO member VALUES " \
-               f"({member}, crypt('{password}', gen_salt('bf')), '{rank}', '{timestamp}')"
-        self.cursor.execute(expr)
+        self.cursor.execute(_INSERT_MEMBER, (member, password, rank, timestamp))
 
     def _validate_member(self, member, password):
-        expr = f"SELECT * FROM member WHERE id={member} AND password=crypt('{password}', password)"
-        self.cursor.execute(expr)
-        if self.cursor.rowcount == 0 or datetime.now().year - self.cursor.fetchone()[-1].year != 0:
+        if self._is_authenticated(member, password):
+            return
+        self.cursor.execute(_SELECT_MEMBER_AUTH, (member, password))
+        row = self.cursor.fetchone()
+        activity_date = row[-1] if row is not None else None
+        self._accept_member(member, password, activity_date)
+
+    def _accept_member(self, member, password, activity_date):
+        if activity_date is None or _current_year() != activity_date.year:
             raise InvalidMember("Authentication failed or member is frozen")
+        self._auth_cache[member] = (password, monotonic(), activity_date.year)
+
+    def _is_authenticated(self, member, password):
+        cached = self._auth_cache.get(member)
+        return cached is not None and cached[0] == password \
+            and monotonic() - cached[1] < self.AUTH_CACHE_TTL \
+            and cached[2] == _current_year()
+
+    def _touch_member(self, member, timestamp):
+        cached = self._auth_cache.get(member)
+        if cached is not None:
+            self._auth_cache[member] = (cached[0], cached[1], localtime(timestamp).tm_year)
 
     def _verify_leader(self, member, password):
         self._validate_member(member, password)
@@ -279,21 +456,40 @@ class PostgresAPI:
             raise InvalidMember("Wrong password or indicated member is not an active leader")
 
     def _row_existence_check(self, table, **kwargs):
-        expr = f"SELECT * FROM {table} {self._generate_condition(**kwargs)}"
-        self.cursor.execute(expr)
-        if self.cursor.rowcount == 0:
+        columns = tuple(sorted(kwargs))
+        self.cursor.execute(_row_exists_statement(table, columns), tuple(kwargs[column] for column in columns))
+        if self.cursor.fetchone() is None:
             raise InvalidRowCount(f"No rows in '{table}' table containing specified parameters")
 
-    def _verify_if_voted(self, member, action):
-        expr = f"SELECT * FROM vote WHERE id_member={member} AND id_action={action}"
-        self.cursor.execute(expr)
-        if self.cursor.rowcount != 0:
-            raise InvalidRowCount(f"Member {member} have already voted for action {action}")
+    def _json_response(self, data):
+        return f'{{"status": "{self.STATUS_SUCCESS}", "data": {data}}}'
+
+    def _write_response(self, response, output):
+        if output is None:
+            return response
+        output.write(response.encode())
+
+    def _can_stream(self):
+        return self.connection.pgconn.pipeline_status == PipelineStatus.OFF
+
+    def _stream_response(self, expr, params, output):
+        with SpooledTemporaryFile(max_size=self.STREAM_SPOOL_SIZE) as spool, \
+                self.connection.cursor(name=f"c_{uuid4().hex}") as cursor:
+            cursor.itersize = self.STREAM_ITERSIZE
+            cursor.execute(expr, params)
+            spool.write(f'{{"status": "{self.STATUS_SUCCESS}", "data": ['.encode())
+            separator = b""
+            for row in cursor:
+                spool.write(separator + b"[" + b", ".join(orjson.dumps(value) for value in row) + b"]")
+                separator = b", "
+            spool.write(b"]}")
+            spool.seek(0)
+            copyfileobj(spool, output)
 
     def _generate_condition(self, **kwargs):
-        return reduce(lambda res, pair: res if pair[1] is None else res + f"AND {pair[0]}='{pair[1]}' ",
-                      kwargs.items(),
-                      "WHERE 1=1 ")
+        items = [(column, value) for column, value in kwargs.items() if value is not None]
+        condition = "WHERE 1=1" + "".join(f" AND {column}=%s" for column, _ in items)
+        return condition, tuple(value for _, value in items)
 
     def __print_table_state(self, table):
         self.cursor.execute(f"SELECT * FROM {table}")